@@ -0,0 +1,173 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+NDI Bridge receiver fast path (Cython)
+Compiled versions of parse_header() and FrameReassembler
+
+ndib_io.py builds this module on the fly with pyximport when Cython is
+installed, and falls back to its pure-Python versions otherwise. Both
+implementations must stay interchangeable.
+
+Requirements:
+    pip install cython
+    C compiler (MSVC Build Tools on Windows)
+"""
+
+from libc.stdint cimport uint8_t, uint16_t, uint32_t, uint64_t
+from libc.string cimport memcpy, memset
+
+cdef enum:
+    MAGIC = 0x4E444942  # "NDIB"
+    HEADER_SIZE = 38
+    MAX_FRAME_SIZE = 4 * 1024 * 1024
+    MAX_TOTAL_SIZE = 64 * 1024 * 1024  # total_size is unauthenticated: never grow past this
+    MASK_WORDS = 1024  # 64 * 1024 bits = every possible U16 fragment index
+
+
+cdef struct Header:
+    uint32_t magic
+    uint8_t version
+    uint8_t media_type
+    uint8_t source_id
+    uint8_t flags
+    uint32_t sequence_number
+    uint64_t timestamp
+    uint32_t total_size
+    uint16_t fragment_index
+    uint16_t fragment_count
+    uint16_t payload_size
+    uint32_t sample_rate
+    uint8_t channels
+
+
+cdef inline uint16_t _be16(const unsigned char* p) noexcept nogil:
+    return (<uint16_t>p[0] << 8) | p[1]
+
+
+cdef inline uint32_t _be32(const unsigned char* p) noexcept nogil:
+    return (<uint32_t>p[0] << 24) | (<uint32_t>p[1] << 16) | (<uint32_t>p[2] << 8) | p[3]
+
+
+cdef inline uint64_t _be64(const unsigned char* p) noexcept nogil:
+    return (<uint64_t>_be32(p) << 32) | _be32(p + 4)
+
+
+cdef bint _parse(const unsigned char* data, Py_ssize_t n, Header* out) noexcept nogil:
+    """Decode the 38-byte big-endian header; False if short or bad magic"""
+    if n < HEADER_SIZE:
+        return False
+
+    out.magic = _be32(data)
+    if out.magic != MAGIC:
+        return False
+
+    out.version = data[4]
+    out.media_type = data[5]
+    out.source_id = data[6]
+    out.flags = data[7]
+    out.sequence_number = _be32(data + 8)
+    out.timestamp = _be64(data + 12)
+    out.total_size = _be32(data + 20)
+    out.fragment_index = _be16(data + 24)
+    out.fragment_count = _be16(data + 26)
+    out.payload_size = _be16(data + 28)
+    out.sample_rate = _be32(data + 30)
+    out.channels = data[34]
+    return True
+
+
+def parse_header(const unsigned char[::1] data):
+    """Parse 38-byte packet header into the same tuple as HEADER_STRUCT, or None"""
+    cdef Header h
+    if data.shape[0] < HEADER_SIZE or not _parse(&data[0], data.shape[0], &h):
+        return None
+
+    return (h.magic, h.version, h.media_type, h.source_id, h.flags,
+            h.sequence_number, h.timestamp, h.total_size, h.fragment_index,
+            h.fragment_count, h.payload_size, h.sample_rate, h.channels)
+
+
+cdef class FrameReassembler:
+    """Collects UDP fragments and reassembles complete frames in place
+
+    Same contract as the pure-Python class: payloads are copied to their
+    final offset in one frame buffer and the completed frame is returned
+    as a memoryview, valid until the next fragment is added.
+    """
+
+    cdef readonly str name
+    cdef bytearray buffer
+    cdef unsigned char* buf
+    cdef uint64_t mask[MASK_WORDS]
+    cdef Py_ssize_t received
+    cdef bint has_sequence
+    cdef uint32_t current_sequence
+    cdef uint16_t expected_count
+    cdef uint32_t total_size
+
+    def __cinit__(self, str name):
+        self.name = name
+        self.buffer = bytearray(MAX_FRAME_SIZE)
+        self.buf = self.buffer
+        memset(self.mask, 0, sizeof(self.mask))
+        self.received = 0
+        self.has_sequence = False
+        self.expected_count = 0
+        self.total_size = 0
+
+    cdef int _reset(self, uint32_t seq, uint16_t frag_count, uint32_t total_size) except -1:
+        # Allocate first: a failed allocation must leave buf and total_size consistent
+        if total_size > len(self.buffer):
+            self.buffer = bytearray(total_size)
+            self.buf = self.buffer
+        memset(self.mask, 0, ((self.expected_count + 63) // 64) * sizeof(uint64_t))
+        self.received = 0
+        self.has_sequence = True
+        self.current_sequence = seq
+        self.expected_count = frag_count
+        self.total_size = total_size
+        return 0
+
+    def add_fragment(self, uint32_t seq, uint16_t frag_idx, uint16_t frag_count, uint32_t total_size,
+                     const unsigned char[::1] payload):
+        """Copy payload into the frame buffer; returns a view of the frame once complete"""
+        cdef Py_ssize_t size = payload.shape[0]
+        cdef Py_ssize_t offset
+        cdef uint64_t bit
+
+        if frag_idx >= frag_count or total_size > MAX_TOTAL_SIZE:
+            return None
+
+        # New sequence - reset
+        if not self.has_sequence or self.current_sequence != seq:
+            if self.has_sequence and self.received:
+                print(f"[{self.name}] Incomplete frame dropped: seq={self.current_sequence}")
+            self._reset(seq, frag_count, total_size)
+
+        # A fragment disagreeing with its sequence would leave a stray mask bit
+        if frag_count != self.expected_count:
+            return None
+
+        # Only the last fragment is shorter; it ends the frame
+        if frag_idx == frag_count - 1:
+            offset = <Py_ssize_t>self.total_size - size
+        else:
+            offset = <Py_ssize_t>frag_idx * size
+        if offset < 0 or offset + size > self.total_size:
+            return None
+
+        # Store fragment
+        if size:
+            memcpy(self.buf + offset, &payload[0], size)
+        bit = (<uint64_t>1) << (frag_idx & 63)
+        if not (self.mask[frag_idx >> 6] & bit):
+            self.mask[frag_idx >> 6] |= bit
+            self.received += 1
+
+        # Check if complete
+        if self.received == self.expected_count:
+            self.received = 0
+            self.has_sequence = False
+            memset(self.mask, 0, ((self.expected_count + 63) // 64) * sizeof(uint64_t))
+            return memoryview(self.buffer)[:self.total_size]
+
+        return None
@@ -0,0 +1,686 @@
+"""
+NDI Bridge receiver I/O
+Shared by the join-python receivers: packet parsing and reassembly,
+batched UDP ingress, the FFmpeg pipe helpers and BridgeReceiver, the
+receive/decode pipeline that receiver.py and receiver_cyndilib.py extend
+with their NDI sender
+
+Optional:
+    pip install cython   (compiled parse_header/FrameReassembler, ndib_fast.pyx)
+    libyuv               (in-process UYVY packing)
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import queue
+import selectors
+import socket
+import struct
+import subprocess
+import threading
+import time
+import sys
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows
+
+import numpy as np
+
+# Protocol constants
+MAGIC = 0x4E444942  # "NDIB"
+HEADER_SIZE = 38
+
+# magic, version, media_type, source_id, flags, sequence_number, timestamp,
+# total_size, fragment_index, fragment_count, payload_size, sample_rate,
+# channels, 3 reserved bytes
+HEADER_STRUCT = struct.Struct('>IBBBBIQIHHHIB3x')
+
+# Receive buffer pool (NetworkSender uses a 1400-byte MTU)
+RECV_BUFFER_SIZE = 2048
+RECV_GRO_BUFFER_SIZE = 65535
+RECV_BATCH = 32
+RECV_DRAIN_BATCHES = 64  # per wakeup, so stats and shutdown still run under sustained load
+SOCKET_RCVBUF = 64 * 1024 * 1024  # absorbs keyframe bursts
+
+# Reassembly buffer pre-allocated per reassembler (grown on demand)
+MAX_FRAME_SIZE = 4 * 1024 * 1024
+MAX_TOTAL_SIZE = 64 * 1024 * 1024  # total_size is unauthenticated: never grow past this
+
+# Decoded frames are read into a ring so an in-flight NDI frame is never overwritten
+FRAME_RING_SIZE = 3
+
+# FFmpeg hardware decoding; 'auto' falls back to software if no device works
+DEFAULT_HWACCEL = 'videotoolbox' if sys.platform == 'darwin' else 'auto'
+
+# FFmpeg pipes: 1 MiB userspace buffer and kernel pipe size (default max for non-root)
+PIPE_SIZE = 1024 * 1024
+F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', 1031)
+
+
+def set_pipe_size(pipe, size=PIPE_SIZE):
+    """Grow the kernel buffer of a subprocess pipe (Linux only, best effort)"""
+    if fcntl is None:
+        return
+    try:
+        fcntl.fcntl(pipe.fileno(), F_SETPIPE_SZ, size)
+    except OSError:
+        pass  # above /proc/sys/fs/pipe-max-size
+
+
+def nv12_frame_size(width, height):
+    """Bytes in one NV12 frame: Y plane + interleaved UV at half size, rounded up"""
+    return width * height + 2 * ((width + 1) // 2) * ((height + 1) // 2)
+
+
+def set_recv_buffer(sock, size=SOCKET_RCVBUF):
+    """Request a large SO_RCVBUF, halving it until the kernel accepts
+
+    Linux clamps silently to net.core.rmem_max; macOS/BSD fail with ENOBUFS
+    above kern.ipc.maxsockbuf (8 MiB by default).
+    """
+    while size >= 64 * 1024:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+            return
+        except OSError:
+            size //= 2
+
+
+def write_all(fd, data):
+    """Write a whole buffer to a pipe fd, looping on partial writes"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+class FrameReassembler:
+    """Collects UDP fragments and reassembles complete frames in place
+
+    NetworkSender cuts every fragment but the last at the same payload size,
+    so each payload is copied straight to its final offset in one
+    pre-allocated frame buffer.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.buffer = bytearray(MAX_FRAME_SIZE)
+        self.mask = 0  # bit i set = fragment i received
+        self.current_sequence = None
+        self.expected_count = 0
+        self.total_size = 0
+
+    def add_fragment(self, seq, frag_idx, frag_count, total_size, payload):
+        """Copy payload into the frame buffer; returns a view of the frame once complete
+
+        The returned view is only valid until the next fragment is added.
+        """
+        if frag_idx >= frag_count or total_size > MAX_TOTAL_SIZE:
+            return None
+
+        # New sequence - reset (allocate first, so a failure leaves the state consistent)
+        if self.current_sequence != seq:
+            if self.current_sequence is not None and self.mask:
+                print(f"[{self.name}] Incomplete frame dropped: seq={self.current_sequence}")
+            if total_size > len(self.buffer):
+                self.buffer = bytearray(total_size)
+            self.mask = 0
+            self.current_sequence = seq
+            self.expected_count = frag_count
+            self.total_size = total_size
+
+        # A fragment disagreeing with its sequence would leave a stray mask bit
+        if frag_count != self.expected_count:
+            return None
+
+        # Only the last fragment is shorter; it ends the frame
+        size = len(payload)
+        offset = self.total_size - size if frag_idx == frag_count - 1 else frag_idx * size
+        if offset < 0 or offset + size > self.total_size:
+            return None
+
+        # Store fragment
+        self.buffer[offset:offset + size] = payload
+        self.mask |= 1 << frag_idx
+
+        # Check if complete
+        if self.mask == (1 << self.expected_count) - 1:
+            self.mask = 0
+            self.current_sequence = None
+            return memoryview(self.buffer)[:self.total_size]
+
+        return None
+
+
+class Float32View:
+    """float32 views of completed PCM frames, sliced from one array per buffer
+
+    Completed frames are memoryviews of their reassembler's buffer: that
+    buffer is wrapped once as a float32 array and each frame is a slice of it.
+    """
+
+    def __init__(self):
+        self.wrapped = None  # (reassembly buffer, float32 array over all of it)
+
+    def view(self, frame):
+        """1-D float32 view of a frame returned by FrameReassembler.add_fragment()"""
+        wrapped = self.wrapped
+        if wrapped is None or wrapped[0] is not frame.obj:
+            buffer = frame.obj
+            wrapped = self.wrapped = (buffer, np.frombuffer(buffer, dtype=np.float32, count=len(buffer) // 4))
+        return wrapped[1][:len(frame) // 4]
+
+
+def parse_header(data):
+    """Parse 38-byte packet header
+
+    Returns the HEADER_STRUCT fields as a tuple, or None if the packet is
+    short or has the wrong magic. Callers unpack it positionally.
+    """
+    if len(data) < HEADER_SIZE:
+        return None
+
+    header = HEADER_STRUCT.unpack_from(data)
+    if header[0] != MAGIC:
+        return None
+
+    return header
+
+
+# Compiled parse_header/FrameReassembler (ndib_fast.pyx) if Cython is available
+try:
+    import pyximport
+    pyximport.install(language_level=3)
+    from ndib_fast import FrameReassembler, parse_header
+    FAST_PATH = True
+except ImportError:
+    FAST_PATH = False
+
+
+# recvmmsg() is Linux-only; load it through ctypes when available
+_libc = None
+if sys.platform.startswith('linux'):
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        _libc.recvmmsg
+    except (OSError, AttributeError):
+        _libc = None
+
+MSG_DONTWAIT = 0x40
+SOL_UDP = 17
+UDP_GRO = getattr(socket, 'UDP_GRO', 104)
+
+# struct cmsghdr { size_t cmsg_len; int cmsg_level; int cmsg_type; }, followed
+# by the int gso_size for UDP_GRO
+CMSG_HEADER_STRUCT = struct.Struct('@Nii')
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_name', ctypes.c_void_p),
+        ('msg_namelen', ctypes.c_uint32),
+        ('msg_iov', ctypes.POINTER(_IOVec)),
+        ('msg_iovlen', ctypes.c_size_t),
+        ('msg_control', ctypes.c_void_p),
+        ('msg_controllen', ctypes.c_size_t),
+        ('msg_flags', ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [('msg_hdr', _MsgHdr), ('msg_len', ctypes.c_uint)]
+
+
+class BatchReceiver:
+    """Receives datagrams into a pool of pre-allocated buffers
+
+    On Linux, recvmmsg() drains up to RECV_BATCH datagrams per syscall and
+    UDP GRO lets the kernel coalesce consecutive datagrams into one buffer,
+    which is split back into packets here. Elsewhere, one datagram is
+    received per call with recvmsg_into() (or recv_into() on Windows).
+    The socket must be non-blocking: call recv_batch() while pending is set
+    to drain it after the selector reports it readable. Returned views are
+    only valid until the next call to recv_batch().
+    """
+
+    def __init__(self, sock, batch=RECV_BATCH):
+        self.sock = sock
+        self.gro = self._enable_gro()
+        buffer_size = RECV_GRO_BUFFER_SIZE if self.gro else RECV_BUFFER_SIZE
+        self.buffers = [bytearray(buffer_size) for _ in range(batch)]
+        self.views = [memoryview(b) for b in self.buffers]
+        self.control_size = socket.CMSG_SPACE(4) if self.gro else 0
+
+        self.msgs = None
+        if _libc is not None:
+            self.iovecs = (_IOVec * batch)()
+            self.msgs = (_MMsgHdr * batch)()
+            self.c_buffers = [(ctypes.c_char * buffer_size).from_buffer(b) for b in self.buffers]
+            self.controls = [ctypes.create_string_buffer(self.control_size) for _ in range(batch)]
+            for i, c_buf in enumerate(self.c_buffers):
+                self.iovecs[i].iov_base = ctypes.addressof(c_buf)
+                self.iovecs[i].iov_len = buffer_size
+                self.msgs[i].msg_hdr.msg_iov = ctypes.pointer(self.iovecs[i])
+                self.msgs[i].msg_hdr.msg_iovlen = 1
+                if self.gro:
+                    self.msgs[i].msg_hdr.msg_control = ctypes.addressof(self.controls[i])
+        self.use_recvmsg = hasattr(sock, 'recvmsg_into')
+        # True while the socket may still hold queued datagrams
+        self.pending = False
+
+    def _enable_gro(self):
+        """Ask the kernel to coalesce datagrams (Linux 5.0+)"""
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            self.sock.setsockopt(SOL_UDP, UDP_GRO, 1)
+            return True
+        except OSError:
+            return False
+
+    def _split(self, view, segment_size, packets):
+        """Append the packets of one (possibly GRO-coalesced) buffer"""
+        if 0 < segment_size < len(view):
+            for offset in range(0, len(view), segment_size):
+                packets.append(view[offset:offset + segment_size])
+        else:
+            packets.append(view)
+
+    def recv_batch(self):
+        """Return a list of packet views, empty once the socket is drained"""
+        packets = []
+        self.pending = False
+
+        if self.msgs is None:
+            mv = self.views[0]
+            try:
+                if self.use_recvmsg:
+                    nbytes, ancdata, _, _ = self.sock.recvmsg_into([mv], self.control_size)
+                else:
+                    nbytes, ancdata = self.sock.recv_into(mv), []
+            except BlockingIOError:
+                return packets
+            segment_size = 0
+            for level, kind, data in ancdata:
+                if level == SOL_UDP and kind == UDP_GRO:
+                    segment_size = struct.unpack('=i', data[:4])[0]
+            self._split(mv[:nbytes], segment_size, packets)
+            self.pending = True
+            return packets
+
+        for msg in self.msgs:
+            msg.msg_hdr.msg_controllen = self.control_size
+
+        count = _libc.recvmmsg(self.sock.fileno(), self.msgs, len(self.msgs), MSG_DONTWAIT, None)
+        if count < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return packets
+            raise OSError(err, os.strerror(err))
+        # A short batch means the queue is empty
+        self.pending = count == len(self.msgs)
+
+        for i in range(count):
+            msg = self.msgs[i]
+            segment_size = 0
+            if self.gro and msg.msg_hdr.msg_controllen >= socket.CMSG_LEN(4):
+                _, level, kind = CMSG_HEADER_STRUCT.unpack_from(self.controls[i])
+                if level == SOL_UDP and kind == UDP_GRO:
+                    segment_size = struct.unpack_from('@i', self.controls[i], socket.CMSG_LEN(0))[0]
+            self._split(self.views[i][:msg.msg_len], segment_size, packets)
+
+        return packets
+
+
+# libyuv is optional; without it FFmpeg packs UYVY itself (swscale)
+_libyuv = None
+if ctypes.util.find_library('yuv'):
+    try:
+        _libyuv = ctypes.CDLL(ctypes.util.find_library('yuv'))
+        _libyuv.I420ToUYVY.argtypes = [ctypes.c_void_p, ctypes.c_int] * 4 + [ctypes.c_int, ctypes.c_int]
+        _libyuv.I420ToUYVY.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _libyuv = None
+LIBYUV = _libyuv is not None
+
+
+class UYVYConverter:
+    """Converts I420 frames from FFmpeg to UYVY in-process with libyuv
+
+    FFmpeg then writes 1.5 bytes/pixel over the pipe instead of 2, and the
+    pack runs on libyuv's SIMD rows instead of swscale.
+    """
+
+    def __init__(self, width, height, dst_buffers):
+        # Odd widths make libyuv write a padded pixel pair past each dst buffer
+        if width % 2:
+            raise ValueError(f"UYVY needs an even width, got {width}")
+        self.width = width
+        self.height = height
+        y_size = width * height
+        chroma_stride = (width + 1) // 2
+        chroma_size = chroma_stride * ((height + 1) // 2)
+        self.chroma_stride = chroma_stride
+
+        self.source_size = y_size + 2 * chroma_size
+        self.source = bytearray(self.source_size)
+        self.source_view = memoryview(self.source)
+
+        # Raw addresses are stable: the bytearrays are never resized
+        self.c_buffers = [(ctypes.c_char * len(b)).from_buffer(b) for b in [self.source] + dst_buffers]
+        base = ctypes.addressof(self.c_buffers[0])
+        self.planes = (base, base + y_size, base + y_size + chroma_size)
+        self.dst = [ctypes.addressof(c_buf) for c_buf in self.c_buffers[1:]]
+
+    def convert(self, slot):
+        """Pack the current source frame into dst_buffers[slot]"""
+        y, u, v = self.planes
+        _libyuv.I420ToUYVY(y, self.width, u, self.chroma_stride, v, self.chroma_stride,
+                           self.dst[slot], self.width * 2, self.width, self.height)
+
+
+class BridgeReceiver:
+    """UDP -> FFmpeg -> NDI pipeline shared by the receivers
+
+    Subclasses provide the NDI side: start_ndi(), send_ndi_video(),
+    send_ndi_audio() and stop_ndi(). Everything else (socket, reassembly,
+    FFmpeg and the decoded-frame ring) lives here.
+    """
+
+    TITLE = "NDI Bridge Receiver"
+
+    def __init__(self, port=5990, ndi_name="NDI Bridge", width=1920, height=1080, hwaccel=DEFAULT_HWACCEL,
+                 fourcc='nv12'):
+        self.port = port
+        self.ndi_name = ndi_name
+        self.width = width
+        self.height = height
+        self.hwaccel = hwaccel
+        self.fourcc = fourcc
+        self.running = False
+
+        # One decoder and one NDI sender: lock onto the first video source
+        self.source_id = None
+        self.reassemblers = (FrameReassembler('video'), FrameReassembler('audio'))  # by media_type
+        self.audio_view = Float32View()
+
+        # Stats
+        self.packets_received = 0
+        self.video_frames = 0
+        self.audio_frames = 0
+        self.bytes_received = 0
+        self.last_stats_time = time.time()
+
+        # FFmpeg decoder
+        self.ffmpeg_process = None
+        self.decoder_thread = None
+        self.send_thread = None
+
+        # Pre-allocated ring of decoded video frames
+        if fourcc == 'nv12':
+            self.frame_size = nv12_frame_size(width, height)
+        else:
+            self.frame_size = width * height * 2  # UYVY = 2 bytes/pixel
+        self.frame_buffers = [bytearray(self.frame_size) for _ in range(FRAME_RING_SIZE)]
+        self.frame_views = [memoryview(b) for b in self.frame_buffers]
+        # 1-D uint8 views, writable since they wrap bytearrays
+        self.frame_arrays = [np.frombuffer(b, dtype=np.uint8) for b in self.frame_buffers]
+
+        # Slot indices handed from decoder_loop to send_loop and back
+        self.free_slots = queue.SimpleQueue()
+        self.ready_slots = queue.SimpleQueue()
+        for slot in range(FRAME_RING_SIZE):
+            self.free_slots.put(slot)
+        self.converter = UYVYConverter(width, height, self.frame_buffers) if fourcc == 'uyvy' and LIBYUV else None
+
+    def start_ndi(self):
+        """Create the NDI sender; returns False on failure"""
+        raise NotImplementedError
+
+    def send_ndi_video(self, frame_array):
+        """Send video frame (numpy view of a ring slot) to NDI"""
+        raise NotImplementedError
+
+    def send_ndi_audio(self, audio, sample_rate, channels):
+        """Send audio frame (1-D float32 view of the reassembled planar PCM) to NDI"""
+        raise NotImplementedError
+
+    def stop_ndi(self):
+        """Release the NDI sender"""
+        raise NotImplementedError
+
+    def start_ffmpeg(self):
+        """Start FFmpeg decoder process"""
+        if self.fourcc == 'nv12':
+            # 4:2:0 like the decoder output, so no 4:2:2 pack. Native for hardware
+            # decoders; software decode (yuv420p) still has swscale interleave UV
+            pix_fmt = 'nv12'
+        elif self.converter:
+            pix_fmt = 'yuv420p'
+        else:
+            pix_fmt = 'uyvy422'
+
+        cmd = [
+            'ffmpeg',
+            '-hide_banner',
+            '-loglevel', 'warning',
+            # Low-latency decode: slice threads (frame threads add a frame of delay each)
+            '-flags', 'low_delay',
+            '-fflags', 'nobuffer',
+            '-threads', '0',
+            '-thread_type', 'slice',
+        ]
+        if self.hwaccel != 'none':
+            # Decoded surfaces are downloaded to system memory for the rawvideo output
+            cmd += ['-hwaccel', self.hwaccel]
+        cmd += [
+            '-f', 'h264',
+            '-i', 'pipe:0',
+            '-f', 'rawvideo',
+            '-pix_fmt', pix_fmt,
+            '-s', f'{self.width}x{self.height}',
+            'pipe:1'
+        ]
+
+        self.ffmpeg_process = subprocess.Popen(
+            cmd,
+            bufsize=PIPE_SIZE,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        set_pipe_size(self.ffmpeg_process.stdin)
+        set_pipe_size(self.ffmpeg_process.stdout)
+
+        # Start decoder output thread
+        self.decoder_thread = threading.Thread(target=self.decoder_loop, daemon=True)
+        self.decoder_thread.start()
+        self.send_thread = threading.Thread(target=self.send_loop, daemon=True)
+        self.send_thread.start()
+
+        print(f"[FFmpeg] Decoder started: {self.width}x{self.height} (hwaccel: {self.hwaccel})")
+        if self.fourcc == 'uyvy':
+            print(f"[FFmpeg] UYVY conversion: {'libyuv' if self.converter else 'swscale'}")
+
+    def decoder_loop(self):
+        """Read decoded frames from FFmpeg into free ring slots"""
+        while self.running and self.ffmpeg_process:
+            try:
+                # Read directly into the next free pre-allocated buffer
+                # (blocks while every slot is queued or in flight in NDI)
+                slot = self.free_slots.get()
+                view = self.frame_views[slot]
+                if self.converter:
+                    complete = self.ffmpeg_process.stdout.readinto(self.converter.source_view) == self.converter.source_size
+                    if complete:
+                        self.converter.convert(slot)
+                else:
+                    complete = self.ffmpeg_process.stdout.readinto(view) == self.frame_size
+
+                if complete:
+                    self.ready_slots.put(slot)
+                else:
+                    self.free_slots.put(slot)
+            except Exception as e:
+                print(f"[Decoder] Error: {e}")
+                break
+
+        self.ready_slots.put(None)
+
+    def send_loop(self):
+        """Publish decoded frames to NDI off the decoder thread"""
+        in_flight = None
+
+        while True:
+            slot = self.ready_slots.get()
+            if slot is None:
+                break
+
+            self.send_ndi_video(self.frame_arrays[slot])
+
+            # NDI may read a frame until the next send returns; recycle the previous one
+            if in_flight is not None:
+                self.free_slots.put(in_flight)
+            in_flight = slot
+
+    def process_packet(self, data):
+        """Process incoming UDP packet
+
+        Only one source is supported: the first video source seen is locked
+        onto and packets from any other source_id are dropped.
+        """
+        header = parse_header(data)
+        if header is None:
+            return
+        (_, _, media_type, source_id, _, seq, _, total_size,
+         frag_idx, frag_count, payload_size, sample_rate, channels) = header
+        if media_type > 1:
+            return
+
+        if source_id != self.source_id:
+            if self.source_id is not None or media_type != 0:
+                return
+            self.source_id = source_id
+            print(f"[UDP] Receiving source {source_id}")
+
+        reassembler = self.reassemblers[media_type]
+
+        self.packets_received += 1
+        self.bytes_received += len(data)
+
+        # View into the receive buffer, copied straight into the reassembly buffer
+        payload = data[HEADER_SIZE:HEADER_SIZE + payload_size]
+
+        if media_type == 0:  # Video
+            frame = reassembler.add_fragment(seq, frag_idx, frag_count, total_size, payload)
+            if frame and self.ffmpeg_process:
+                try:
+                    # Straight from the reassembly buffer to the pipe: no
+                    # BufferedWriter copy, no separate flush()
+                    write_all(self.ffmpeg_process.stdin.fileno(), frame)
+                except Exception as e:
+                    print(f"[FFmpeg] Write error: {e}")
+
+        elif media_type == 1:  # Audio
+            frame = reassembler.add_fragment(seq, frag_idx, frag_count, total_size, payload)
+            if frame:
+                self.send_ndi_audio(self.audio_view.view(frame), sample_rate, channels)
+
+    def log_stats(self):
+        """Log statistics every second"""
+        now = time.time()
+        elapsed = now - self.last_stats_time
+
+        if elapsed > 0 and self.packets_received > 0:
+            mbps = (self.bytes_received * 8 / elapsed / 1_000_000)
+            print(f"[Stats] {mbps:.2f} Mbps | Video: {self.video_frames} | Audio: {self.audio_frames} | Packets: {self.packets_received}")
+
+        self.packets_received = 0
+        self.bytes_received = 0
+        self.video_frames = 0
+        self.audio_frames = 0
+        self.last_stats_time = now
+
+    def open_socket(self):
+        """Create the bound, non-blocking UDP socket"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        set_recv_buffer(sock)
+        sock.bind(('0.0.0.0', self.port))
+        sock.setblocking(False)
+        return sock
+
+    def receive_loop(self, receiver):
+        """Receive and reassemble packets until stopped"""
+        selector = selectors.DefaultSelector()
+        selector.register(receiver.sock, selectors.EVENT_READ)
+        next_stats = time.monotonic() + 1.0
+
+        try:
+            while self.running:
+                # Sleep until data arrives or the next stats deadline (1s to re-check running)
+                if selector.select(timeout=max(0.0, next_stats - time.monotonic())):
+                    # Drain, up to a bound: leftover datagrams wake the next select()
+                    for _ in range(RECV_DRAIN_BATCHES):
+                        for data in receiver.recv_batch():
+                            self.process_packet(data)
+                        if not receiver.pending or time.monotonic() >= next_stats:
+                            break
+
+                # Log stats every second
+                if time.monotonic() >= next_stats:
+                    self.log_stats()
+                    next_stats = time.monotonic() + 1.0
+        finally:
+            selector.close()
+
+    def run(self):
+        """Main receiver loop"""
+        print("=" * 50)
+        print(self.TITLE)
+        print("=" * 50)
+        print(f"Port: {self.port}")
+        print(f"NDI Name: {self.ndi_name}")
+        print(f"Resolution: {self.width}x{self.height} ({self.fourcc.upper()})")
+        print(f"Fast path: {'Cython' if FAST_PATH else 'pure Python'}")
+        print("=" * 50)
+
+        # Initialize components
+        if not self.start_ndi():
+            return
+
+        # Set before the decoder threads start, they exit as soon as it is False
+        self.running = True
+        self.start_ffmpeg()
+
+        # Create UDP socket
+        sock = self.open_socket()
+        receiver = BatchReceiver(sock)
+
+        print(f"[UDP] Listening on 0.0.0.0:{self.port}")
+        print(f"[UDP] Receive buffer: {sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) // 1024} KiB"
+              f" | GRO: {'on' if receiver.gro else 'off'}")
+        print("[Main] Ready - waiting for stream...")
+        print("[Main] Press Ctrl+C to stop")
+
+        try:
+            self.receive_loop(receiver)
+
+        except KeyboardInterrupt:
+            print("\n[Main] Shutting down...")
+
+        finally:
+            self.running = False
+            self.ready_slots.put(None)
+            sock.close()
+            if self.ffmpeg_process:
+                self.ffmpeg_process.terminate()
+            self.stop_ndi()
+            print("[Main] Stopped")
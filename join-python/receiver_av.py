@@ -2,7 +2,6 @@
 """NDI Bridge Receiver with Audio+Video support"""
 
 import socket
-import struct
 import subprocess
 import threading
 import time
@@ -15,16 +14,20 @@ from cyndilib.audio_frame import AudioSendFrame
 from cyndilib.wrapper.ndi_structs import FourCC
 import numpy as np
 
-# Protocol
-MAGIC = 0x4E444942
-HEADER_SIZE = 38
+from ndib_io import (MAGIC, HEADER_SIZE, HEADER_STRUCT, PIPE_SIZE, Float32View, FrameReassembler, nv12_frame_size,
+                     set_pipe_size)
+
+FRAME_RING_SIZE = 3  # decoded frames in flight
+
 
 class Receiver:
     def __init__(self, port=5990, name="NDI Bridge", width=1920, height=1080):
         self.port = port
         self.width = width
         self.height = height
-        self.frame_size = width * height * 2  # UYVY
+        self.frame_size = nv12_frame_size(width, height)  # sent to NDI as decoded
+        self.frame_buffers = [bytearray(self.frame_size) for _ in range(FRAME_RING_SIZE)]
+        self.frame_arrays = [np.frombuffer(b, dtype=np.uint8) for b in self.frame_buffers]
         self.running = True
 
         # Stats
@@ -41,23 +44,28 @@ class Receiver:
         self.vf = VideoSendFrame()
         self.vf.set_resolution(width, height)
         self.vf.set_frame_rate(Fraction(30, 1))
-        self.vf.set_fourcc(FourCC.UYVY)
+        self.vf.set_fourcc(FourCC.NV12)
         self.sender.set_video_frame(self.vf)
         print(f"[NDI] Video: {width}x{height}")
 
         # Audio disabled for now - causes MemoryError
         self.af = None
+        self.audio_view = Float32View()
         print("[NDI] Audio: DISABLED (video only)")
 
         # FFmpeg decoder
         print("[FFmpeg] Starting decoder...")
         self.ffmpeg = subprocess.Popen(
             ['ffmpeg', '-hide_banner', '-loglevel', 'warning',
+             '-flags', 'low_delay', '-fflags', 'nobuffer',
+             '-threads', '0', '-thread_type', 'slice',
              '-f', 'h264', '-i', 'pipe:0',
-             '-f', 'rawvideo', '-pix_fmt', 'uyvy422',
+             '-f', 'rawvideo', '-pix_fmt', 'nv12',
              '-s', f'{width}x{height}', 'pipe:1'],
-            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            bufsize=PIPE_SIZE, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
         )
+        set_pipe_size(self.ffmpeg.stdin)
+        set_pipe_size(self.ffmpeg.stdout)
 
         # Decoder thread
         self.decoder_thread = threading.Thread(target=self.decode_loop, daemon=True)
@@ -65,17 +73,19 @@ class Receiver:
     def decode_loop(self):
         """Read decoded video from FFmpeg and send to NDI"""
         print("[Decoder] Thread started, waiting for frames...")
+        slot = 0
         while self.running:
             try:
-                data = self.ffmpeg.stdout.read(self.frame_size)
-                if len(data) == self.frame_size:
-                    arr = np.frombuffer(data, dtype=np.uint8).copy()
-                    self.sender.write_video_async(arr)
+                buf = self.frame_buffers[slot]
+                n = self.ffmpeg.stdout.readinto(buf)
+                if n == self.frame_size:
+                    self.sender.write_video_async(self.frame_arrays[slot])
+                    slot = (slot + 1) % FRAME_RING_SIZE
                     self.video_frames += 1
                     if self.video_frames == 1:
                         print("[Decoder] First frame decoded!")
-                elif len(data) > 0:
-                    print(f"[Decoder] Partial frame: {len(data)}/{self.frame_size} bytes")
+                elif n:
+                    print(f"[Decoder] Partial frame: {n}/{self.frame_size} bytes")
                 else:
                     # Check FFmpeg stderr for errors
                     err = self.ffmpeg.stderr.read(1024)
@@ -92,9 +102,10 @@ class Receiver:
         if self.af is None:
             return  # Audio disabled
         try:
-            audio_float = np.frombuffer(audio_data, dtype=np.float32).copy()
+            # Planar float32: reshape a view of the reassembled frame, no copy
+            audio_float = self.audio_view.view(audio_data)
             samples = len(audio_float) // channels
-            audio_2d = audio_float.reshape((channels, samples))
+            audio_2d = audio_float[:samples * channels].reshape((channels, samples))
             self.sender.write_audio(audio_2d)
             self.audio_frames += 1
         except Exception as e:
@@ -117,11 +128,9 @@ class Receiver:
         print(f"[UDP] Listening on port {self.port}")
         print("[Main] Ready - waiting for stream...")
 
-        # Reassembly buffers
-        video_frags = {}
-        video_seq = None
-        audio_frags = {}
-        audio_seq = None
+        # Reassembly, in place (no per-frame join)
+        video_reassembler = FrameReassembler('video')
+        audio_reassembler = FrameReassembler('audio')
 
         last_log = time.time()
 
@@ -132,29 +141,18 @@ class Receiver:
                     if len(data) < HEADER_SIZE:
                         continue
 
-                    magic = struct.unpack('>I', data[0:4])[0]
+                    (magic, _, media_type, _, _, seq, _, total_size,
+                     frag_idx, frag_count, payload_size, _, channels) = HEADER_STRUCT.unpack_from(data)
                     if magic != MAGIC:
                         continue
 
-                    media_type = data[5]
-                    seq = struct.unpack('>I', data[8:12])[0]
-                    frag_idx = struct.unpack('>H', data[24:26])[0]
-                    frag_count = struct.unpack('>H', data[26:28])[0]
-                    payload_size = struct.unpack('>H', data[28:30])[0]
-                    channels = data[34]
-                    payload = data[HEADER_SIZE:HEADER_SIZE + payload_size]
+                    payload = memoryview(data)[HEADER_SIZE:HEADER_SIZE + payload_size]
 
                     self.packets += 1
 
                     if media_type == 0:  # Video
-                        if video_seq != seq:
-                            video_frags = {}
-                            video_seq = seq
-                        video_frags[frag_idx] = payload
-                        if len(video_frags) == frag_count:
-                            frame = b''.join(video_frags[i] for i in range(frag_count))
-                            video_frags = {}
-                            video_seq = None
+                        frame = video_reassembler.add_fragment(seq, frag_idx, frag_count, total_size, payload)
+                        if frame:
                             self.ffmpeg.stdin.write(frame)
                             self.ffmpeg.stdin.flush()
                             self.h264_frames += 1
@@ -162,14 +160,8 @@ class Receiver:
                                 print(f"[Video] First H.264 frame: {len(frame)} bytes")
 
                     elif media_type == 1:  # Audio
-                        if audio_seq != seq:
-                            audio_frags = {}
-                            audio_seq = seq
-                        audio_frags[frag_idx] = payload
-                        if len(audio_frags) == frag_count:
-                            frame = b''.join(audio_frags[i] for i in range(frag_count))
-                            audio_frags = {}
-                            audio_seq = None
+                        frame = audio_reassembler.add_fragment(seq, frag_idx, frag_count, total_size, payload)
+                        if frame:
                             self.send_audio(frame, channels if channels > 0 else 2)
 
                 except socket.timeout:
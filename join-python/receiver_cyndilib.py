@@ -12,12 +12,7 @@ Requirements:
     NDI Runtime installed
 """
 
-import socket
-import struct
-import subprocess
-import threading
 import argparse
-import time
 import sys
 from fractions import Fraction
 
@@ -30,109 +25,21 @@ except ImportError:
     print("ERROR: cyndilib not installed. Run: pip install cyndilib")
     sys.exit(1)
 
-import numpy as np
+from ndib_io import DEFAULT_HWACCEL, BridgeReceiver
 
-# Protocol constants
-MAGIC = 0x4E444942  # "NDIB"
-HEADER_SIZE = 38
 
+class NDIBridgeReceiver(BridgeReceiver):
+    TITLE = "NDI Bridge Receiver (Python + cyndilib)"
 
-class FrameReassembler:
-    """Collects UDP fragments and reassembles complete frames"""
-
-    def __init__(self, name):
-        self.name = name
-        self.fragments = {}
-        self.current_sequence = None
-        self.expected_count = 0
-
-    def add_fragment(self, header, payload):
-        seq = header['sequence_number']
-        frag_idx = header['fragment_index']
-        frag_count = header['fragment_count']
-
-        # New sequence - reset
-        if self.current_sequence != seq:
-            if self.current_sequence is not None and len(self.fragments) > 0:
-                print(f"[{self.name}] Incomplete frame dropped: seq={self.current_sequence}")
-            self.fragments = {}
-            self.current_sequence = seq
-            self.expected_count = frag_count
-
-        # Store fragment
-        self.fragments[frag_idx] = payload
-
-        # Check if complete
-        if len(self.fragments) == frag_count:
-            # Reassemble in order
-            data = b''.join(self.fragments[i] for i in range(frag_count))
-            self.fragments = {}
-            self.current_sequence = None
-            return data
-
-        return None
-
-
-def parse_header(data):
-    """Parse 38-byte packet header"""
-    if len(data) < HEADER_SIZE:
-        return None
-
-    magic = struct.unpack('>I', data[0:4])[0]
-    if magic != MAGIC:
-        return None
-
-    return {
-        'magic': magic,
-        'version': data[4],
-        'media_type': data[5],  # 0=video, 1=audio
-        'source_id': data[6],
-        'flags': data[7],
-        'sequence_number': struct.unpack('>I', data[8:12])[0],
-        'timestamp': struct.unpack('>Q', data[12:20])[0],
-        'total_size': struct.unpack('>I', data[20:24])[0],
-        'fragment_index': struct.unpack('>H', data[24:26])[0],
-        'fragment_count': struct.unpack('>H', data[26:28])[0],
-        'payload_size': struct.unpack('>H', data[28:30])[0],
-        'sample_rate': struct.unpack('>I', data[30:34])[0],
-        'channels': data[34],
-        'is_keyframe': (data[7] & 0x01) == 1
-    }
-
-
-class NDIBridgeReceiver:
-    def __init__(self, port=5990, ndi_name="NDI Bridge", width=1920, height=1080):
-        self.port = port
-        self.ndi_name = ndi_name
-        self.width = width
-        self.height = height
-        self.running = False
-
-        # Reassemblers
-        self.video_reassembler = FrameReassembler('video')
-        self.audio_reassembler = FrameReassembler('audio')
-
-        # Stats
-        self.packets_received = 0
-        self.video_frames = 0
-        self.audio_frames = 0
-        self.bytes_received = 0
-        self.last_stats_time = time.time()
+    def __init__(self, port=5990, ndi_name="NDI Bridge", width=1920, height=1080, hwaccel=DEFAULT_HWACCEL,
+                 fourcc='nv12'):
+        super().__init__(port, ndi_name, width, height, hwaccel, fourcc)
 
         # NDI sender (cyndilib)
         self.sender = None
         self.video_frame = None
         self.audio_frame = None
 
-        # FFmpeg decoder
-        self.ffmpeg_process = None
-        self.decoder_thread = None
-
-        # Pre-allocated buffer for video frames
-        self.frame_size = width * height * 2  # UYVY = 2 bytes/pixel
-        self.video_buffer = bytearray(self.frame_size)
-        self.video_memview = memoryview(self.video_buffer)
-
     def start_ndi(self):
         """Initialize NDI sender using cyndilib"""
         try:
@@ -145,7 +52,7 @@ class NDIBridgeReceiver:
             self.video_frame = VideoSendFrame()
             self.video_frame.set_resolution(self.width, self.height)
             self.video_frame.set_frame_rate(Fraction(30, 1))  # 30 fps
-            self.video_frame.set_fourcc(FourCC.UYVY)
+            self.video_frame.set_fourcc(FourCC.NV12 if self.fourcc == 'nv12' else FourCC.UYVY)
             self.sender.set_video_frame(self.video_frame)
             print("[NDI] VideoSendFrame configured")
 
@@ -166,168 +73,36 @@ class NDIBridgeReceiver:
             traceback.print_exc()
             return False
 
-    def start_ffmpeg(self):
-        """Start FFmpeg decoder process"""
-        cmd = [
-            'ffmpeg',
-            '-hide_banner',
-            '-loglevel', 'warning',
-            '-f', 'h264',
-            '-i', 'pipe:0',
-            '-f', 'rawvideo',
-            '-pix_fmt', 'uyvy422',
-            '-s', f'{self.width}x{self.height}',
-            'pipe:1'
-        ]
-
-        self.ffmpeg_process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-
-        # Start decoder output thread
-        self.decoder_thread = threading.Thread(target=self.decoder_loop, daemon=True)
-        self.decoder_thread.start()
-
-        print(f"[FFmpeg] Decoder started: {self.width}x{self.height}")
-
-    def decoder_loop(self):
-        """Read decoded frames from FFmpeg and send to NDI"""
-        while self.running and self.ffmpeg_process:
-            try:
-                # Read directly into pre-allocated buffer
-                data = self.ffmpeg_process.stdout.read(self.frame_size)
-                if len(data) == self.frame_size:
-                    self.send_ndi_video(data)
-            except Exception as e:
-                print(f"[Decoder] Error: {e}")
-                break
-
-    def send_ndi_video(self, frame_data):
-        """Send video frame to NDI via cyndilib"""
+    def send_ndi_video(self, frame_array):
+        """Send video frame (numpy view of a ring slot) to NDI via cyndilib"""
         if not self.sender:
             return
 
         try:
-            # Convert to numpy array (1-D uint8), copy to make writable
-            video_array = np.frombuffer(frame_data, dtype=np.uint8).copy()
-            self.sender.write_video_async(video_array)
+            self.sender.write_video_async(frame_array)
             self.video_frames += 1
         except Exception as e:
             print(f"[NDI] Video send error: {e}")
 
-    def send_ndi_audio(self, audio_data, sample_rate, channels):
+    def send_ndi_audio(self, audio, sample_rate, channels):
         """Send audio frame to NDI via cyndilib"""
         if not self.sender or not self.audio_frame:
             return
 
         try:
-            # Convert to float32 and reshape to (channels, samples)
-            # Use .copy() to make array writable
-            audio_float = np.frombuffer(audio_data, dtype=np.float32).copy()
-            samples = len(audio_float) // channels
-            audio_2d = audio_float.reshape((channels, samples))
+            # Planar float32 viewed as (channels, samples), still without a copy
+            samples = len(audio) // channels
+            audio_2d = audio[:samples * channels].reshape((channels, samples))
 
             self.sender.write_audio(audio_2d)
             self.audio_frames += 1
         except Exception as e:
             print(f"[NDI] Audio send error: {e}")
 
-    def process_packet(self, data):
-        """Process incoming UDP packet"""
-        header = parse_header(data)
-        if not header:
-            return
-
-        self.packets_received += 1
-        self.bytes_received += len(data)
-
-        payload = data[HEADER_SIZE:HEADER_SIZE + header['payload_size']]
-
-        if header['media_type'] == 0:  # Video
-            frame = self.video_reassembler.add_fragment(header, payload)
-            if frame and self.ffmpeg_process:
-                try:
-                    self.ffmpeg_process.stdin.write(frame)
-                    self.ffmpeg_process.stdin.flush()
-                except Exception as e:
-                    print(f"[FFmpeg] Write error: {e}")
-
-        elif header['media_type'] == 1:  # Audio
-            frame = self.audio_reassembler.add_fragment(header, payload)
-            if frame:
-                self.send_ndi_audio(frame, header['sample_rate'], header['channels'])
-
-    def log_stats(self):
-        """Log statistics every second"""
-        now = time.time()
-        elapsed = now - self.last_stats_time
-
-        if elapsed > 0 and self.packets_received > 0:
-            mbps = (self.bytes_received * 8 / elapsed / 1_000_000)
-            print(f"[Stats] {mbps:.2f} Mbps | Video: {self.video_frames} | Audio: {self.audio_frames} | Packets: {self.packets_received}")
-
-        self.packets_received = 0
-        self.bytes_received = 0
-        self.video_frames = 0
-        self.audio_frames = 0
-        self.last_stats_time = now
-
-    def run(self):
-        """Main receiver loop"""
-        print("=" * 50)
-        print("NDI Bridge Receiver (Python + cyndilib)")
-        print("=" * 50)
-        print(f"Port: {self.port}")
-        print(f"NDI Name: {self.ndi_name}")
-        print(f"Resolution: {self.width}x{self.height}")
-        print("=" * 50)
-
-        # Initialize components
-        if not self.start_ndi():
-            return
-
-        self.start_ffmpeg()
-
-        # Create UDP socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        sock.bind(('0.0.0.0', self.port))
-        sock.settimeout(1.0)
-
-        print(f"[UDP] Listening on 0.0.0.0:{self.port}")
-        print("[Main] Ready - waiting for stream...")
-        print("[Main] Press Ctrl+C to stop")
-
-        self.running = True
-        last_stats = time.time()
-
-        try:
-            while self.running:
-                try:
-                    data, addr = sock.recvfrom(65535)
-                    self.process_packet(data)
-                except socket.timeout:
-                    pass
-
-                # Log stats every second
-                if time.time() - last_stats >= 1.0:
-                    self.log_stats()
-                    last_stats = time.time()
-
-        except KeyboardInterrupt:
-            print("\n[Main] Shutting down...")
-
-        finally:
-            self.running = False
-            sock.close()
-            if self.ffmpeg_process:
-                self.ffmpeg_process.terminate()
-            if self.sender:
-                self.sender.close()
-            print("[Main] Stopped")
+    def stop_ndi(self):
+        """Close the cyndilib sender"""
+        if self.sender:
+            self.sender.close()
 
 
 def main():
@@ -336,14 +111,22 @@ def main():
     parser.add_argument('--name', '-n', type=str, default='NDI Bridge', help='NDI source name')
     parser.add_argument('--width', '-w', type=int, default=1920, help='Video width')
     parser.add_argument('--height', type=int, default=1080, help='Video height')
+    parser.add_argument('--fourcc', choices=['nv12', 'uyvy'], default='nv12',
+                        help='NDI pixel format (default: nv12, skips the 4:2:2 pack)')
+    parser.add_argument('--hwaccel', type=str, default=DEFAULT_HWACCEL,
+                        help=f'FFmpeg hwaccel: auto, videotoolbox, vaapi, cuda, d3d11va, none (default: {DEFAULT_HWACCEL})')
 
     args = parser.parse_args()
+    if args.fourcc == 'uyvy' and args.width % 2:
+        parser.error('--fourcc uyvy needs an even --width (UYVY packs pixel pairs)')
 
     receiver = NDIBridgeReceiver(
         port=args.port,
         ndi_name=args.name,
         width=args.width,
-        height=args.height
+        height=args.height,
+        hwaccel=args.hwaccel,
+        fourcc=args.fourcc
     )
     receiver.run()
 
@@ -2,7 +2,6 @@
 """Minimal NDI receiver - video only, no frills"""
 
 import socket
-import struct
 import subprocess
 import threading
 import time
@@ -14,16 +13,19 @@ from cyndilib.video_frame import VideoSendFrame
 from cyndilib.wrapper.ndi_structs import FourCC
 import numpy as np
 
-# Protocol
-MAGIC = 0x4E444942
-HEADER_SIZE = 38
+from ndib_io import MAGIC, HEADER_SIZE, HEADER_STRUCT, PIPE_SIZE, nv12_frame_size, set_pipe_size
+
+FRAME_RING_SIZE = 3  # decoded frames in flight
+
 
 class MinimalReceiver:
     def __init__(self, port=5990, name="NDI Bridge", width=1920, height=1080):
         self.port = port
         self.width = width
         self.height = height
-        self.frame_size = self.width * self.height * 2
+        self.frame_size = nv12_frame_size(self.width, self.height)
+        self.frame_buffers = [bytearray(self.frame_size) for _ in range(FRAME_RING_SIZE)]
+        self.frame_arrays = [np.frombuffer(b, dtype=np.uint8) for b in self.frame_buffers]
 
         # NDI
         print("[1] Creating Sender...")
@@ -33,7 +35,7 @@ class MinimalReceiver:
         self.vf = VideoSendFrame()
         self.vf.set_resolution(self.width, self.height)
         self.vf.set_frame_rate(Fraction(30, 1))
-        self.vf.set_fourcc(FourCC.UYVY)
+        self.vf.set_fourcc(FourCC.NV12)
 
         print("[3] Adding frame to sender...")
         self.sender.set_video_frame(self.vf)
@@ -46,11 +48,15 @@ class MinimalReceiver:
         print("[6] Starting FFmpeg...")
         self.ffmpeg = subprocess.Popen(
             ['ffmpeg', '-hide_banner', '-loglevel', 'warning',
+             '-flags', 'low_delay', '-fflags', 'nobuffer',
+             '-threads', '0', '-thread_type', 'slice',
              '-f', 'h264', '-i', 'pipe:0',
-             '-f', 'rawvideo', '-pix_fmt', 'uyvy422',
+             '-f', 'rawvideo', '-pix_fmt', 'nv12',
              '-s', f'{self.width}x{self.height}', 'pipe:1'],
-            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            bufsize=PIPE_SIZE, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
         )
+        set_pipe_size(self.ffmpeg.stdin)
+        set_pipe_size(self.ffmpeg.stdout)
         print("[7] FFmpeg started!")
 
         # Decoder thread
@@ -60,12 +66,13 @@ class MinimalReceiver:
         self.decoder_thread.start()
 
     def decode_loop(self):
+        slot = 0
         while self.running:
             try:
-                data = self.ffmpeg.stdout.read(self.frame_size)
-                if len(data) == self.frame_size:
-                    arr = np.frombuffer(data, dtype=np.uint8).copy()
-                    self.sender.write_video_async(arr)
+                buf = self.frame_buffers[slot]
+                if self.ffmpeg.stdout.readinto(buf) == self.frame_size:
+                    self.sender.write_video_async(self.frame_arrays[slot])
+                    slot = (slot + 1) % FRAME_RING_SIZE
                     self.video_frames += 1
             except:
                 break
@@ -92,19 +99,15 @@ class MinimalReceiver:
                     if len(data) < HEADER_SIZE:
                         continue
 
-                    magic = struct.unpack('>I', data[0:4])[0]
+                    (magic, _, media_type, _, _, seq, _, _,
+                     frag_idx, frag_count, payload_size, _, _) = HEADER_STRUCT.unpack_from(data)
                     if magic != MAGIC:
                         continue
 
-                    media_type = data[5]
                     if media_type != 0:  # Skip audio
                         continue
 
-                    seq = struct.unpack('>I', data[8:12])[0]
-                    frag_idx = struct.unpack('>H', data[24:26])[0]
-                    frag_count = struct.unpack('>H', data[26:28])[0]
-                    payload_size = struct.unpack('>H', data[28:30])[0]
-                    payload = data[HEADER_SIZE:HEADER_SIZE + payload_size]
+                    payload = memoryview(data)[HEADER_SIZE:HEADER_SIZE + payload_size]
 
                     packets += 1
 
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Check that the Cython and pure-Python FrameReassembler agree
+
+Usage:
+    python test_reassembler.py   (needs Cython, see README)
+"""
+
+import random
+import sys
+
+# Import ndib_io with pyximport hidden so it keeps its pure-Python classes
+sys.modules['pyximport'] = None
+import ndib_io
+del sys.modules['pyximport']
+
+try:
+    import pyximport
+    pyximport.install(language_level=3)
+    import ndib_fast
+except ImportError:
+    ndib_fast = None
+
+PAYLOAD_SIZE = 1362
+
+
+def fragments(seq, frame):
+    """(seq, frag_idx, frag_count, total_size, payload) tuples for one frame"""
+    count = -(-len(frame) // PAYLOAD_SIZE)
+    return [(seq, i, count, len(frame), frame[i * PAYLOAD_SIZE:(i + 1) * PAYLOAD_SIZE])
+            for i in range(count)]
+
+
+def fragment_stream():
+    """Frames with reordering, loss, a fragment whose frag_count is wrong and a spoofed size"""
+    rng = random.Random(1)
+    frames = [rng.randbytes(rng.randint(1, 500_000)) for _ in range(6)]
+    frames[1] = rng.randbytes(10 * PAYLOAD_SIZE - 7)
+    frames.append(rng.randbytes(300 * PAYLOAD_SIZE))  # keyframe-sized
+
+    stream = []
+    for seq, frame in enumerate(frames):
+        frags = fragments(seq, frame)
+        rng.shuffle(frags)
+        if seq == 1:
+            # Valid offset, but frag_count disagrees with the rest of seq 1
+            frags.insert(len(frags) // 2, (seq, 250, 300, len(frame), frame[:1]))
+        if seq == 2:
+            # total_size far above MAX_TOTAL_SIZE: must be dropped without allocating
+            # or disturbing frame 2
+            frags.insert(len(frags) // 2, (1000, 0, 1, 0xFFFFFFF0, frame[:1]))
+        if seq == 3:
+            frags.pop()  # lost fragment: frame 3 is dropped
+        stream += frags
+    return frames, stream
+
+
+def reassemble(cls, stream):
+    reassembler = cls('video')
+    completed = []
+    for seq, frag_idx, frag_count, total_size, payload in stream:
+        frame = reassembler.add_fragment(seq, frag_idx, frag_count, total_size, payload)
+        if frame is not None:
+            completed.append((seq, bytes(frame)))
+    return completed
+
+
+def test_reassemblers_agree():
+    frames, stream = fragment_stream()
+    expected = [(seq, frame) for seq, frame in enumerate(frames) if seq != 3]
+
+    assert reassemble(ndib_io.FrameReassembler, stream) == expected
+    if ndib_fast is not None:
+        assert reassemble(ndib_fast.FrameReassembler, stream) == expected
+
+
+if __name__ == '__main__':
+    test_reassemblers_agree()
+    print(f"OK ({'Cython and pure Python' if ndib_fast else 'pure Python only, Cython not installed'})")